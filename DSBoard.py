@@ -114,13 +114,9 @@ class Board:
 
                 player_response.extend(end_response)
             # randomize order of presented options, if desired....
+            #    (random.shuffle is an in-place Fisher-Yates shuffle, so this is O(n).)
             if randomize:
-                temp: Possible_Moves_List = []
-                while len(player_response) > 0:
-                    loc = random.randint(0, len(player_response) - 1)
-                    temp.append(player_response[loc])
-                    del (player_response[loc])
-                player_response = temp
+                random.shuffle(player_response)
 
             # add this list of responses to the list of response lists (one list per player)
             responses.append(player_response)
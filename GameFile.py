@@ -5,6 +5,7 @@ from HumanPlayerFile import HumanPlayer
 from OneStepPlayerFile import OneStepPlayer
 # from MinimaxPlayerFile import MinimaxPlayer
 # from ABMinimaxPlayerFile import ABMinimaxPlayer
+# from SearchPlayerFile import SearchPlayer
 from DSBoard import Board, Coord, Move, Possible_Moves_List, GAME_MODE_6, GAME_MODE_10, GAME_MODE_14
 import datetime
 from typing import Tuple, List
@@ -0,0 +1,335 @@
+import numpy as np
+import random
+from PlayerFile import Player
+from DSBoard import Board, Move, Possible_Moves_List
+from typing import Tuple, List, Callable, Dict, Optional
+
+# flags for the transposition table - is the stored score exact, or just a bound?
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+WIN_SCORE = 100000  # bigger than anything score_for_board should ever return.
+# any score farther from zero than this is a win or loss, rather than an estimate from score_for_board.
+WIN_THRESHOLD = WIN_SCORE // 2
+
+KILLERS_PER_PLY = 2  # how many killer moves we remember at each ply.
+
+# late-move reductions: after the first few (well-ordered) moves, search the rest more shallowly.
+LMR_FULL_DEPTH_MOVES = 3  # this many moves at each node are always searched to full depth.
+LMR_MIN_DEPTH = 3  # don't bother reducing when there is this little depth left.
+LMR_REDUCTION = 1  # how many plies shallower a reduced search goes.
+
+# clear the transposition table if it gets bigger than this, to keep memory in check. (Each entry is roughly 300-400
+#    bytes on a 10x10 board, so this is on the order of 100 MB.)
+MAX_TABLE_SIZE = 250000
+
+# scores given to moves for ordering purposes. Anything from the history table fits below KILLER_ORDER_SCORE.
+TT_MOVE_ORDER_SCORE = 1 << 30
+KILLER_ORDER_SCORE = 1 << 29
+
+
+class SearchPlayer(Player):
+    """
+    A framework for players that look several moves ahead. It runs an iterative-deepening alpha-beta (negamax) search,
+    and orders the moves at each node so that alpha-beta can cut off as many branches as possible:
+        1) the best move found for this position in an earlier search (from the transposition table),
+        2) "killer" moves - moves that caused a beta cutoff at the same ply elsewhere in the tree,
+        3) everything else, sorted by the history table, which is indexed by (cell, heading).
+    Moves late in the ordering are searched with a reduced depth (late-move reductions), and re-searched at full
+    depth if they turn out to be better than expected.
+
+    To make your own searching player, inherit from this class and override score_for_board(). The search passes in
+    the possible moves it has already generated for the board, so your evaluation doesn't need to generate them again.
+    """
+    def __init__(self, max_depth: int = 20, seed: Optional[int] = None, time_margin: float = 0.05,
+                 verbose: bool = False):
+        """
+        :param max_depth: the deepest we will ever search, even if there is time left.
+        :param seed: a seed for the random number generator, so that games can be repeated. (None = unseeded.)
+        :param time_margin: how many seconds before the time limit we should give up and return our best move.
+        :param verbose: whether to print the result of each depth of the search.
+        """
+        super().__init__()
+        self.max_depth = max_depth
+        self.time_margin = time_margin
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+
+        # key -> (depth, score, flag, best_move)
+        self.transposition_table: Dict[bytes, Tuple[int, int, int, Optional[Move]]] = {}
+        # ply -> list of up to KILLERS_PER_PLY moves
+        self.killer_moves: List[List[Move]] = [[] for _ in range(max_depth + 1)]
+        # history[r, c, heading] - created in select_move, once we know the board size.
+        self.history_table: np.ndarray = np.zeros((0, 0, 8), dtype=int)
+
+        self.get_expired_time_method: Callable = None
+        self.out_of_time = False
+        self.nodes_searched = 0
+
+    def select_move(self, board: Board, which_player_am_I: int,
+                    get_expired_time_method: Callable,
+                    opponents_move: Move = None) -> Move:
+        """
+        searches deeper and deeper until time runs out, and returns the best move from the deepest completed search.
+        :param board: the current state of the board (a copy, so you can modify it.)
+        :param which_player_am_I: Either 0 or 1
+        :param get_expired_time_method: returns (time expired, time remaining), in seconds.
+        :param opponents_move: the move your opponent just made, if any.
+        :return: the move to make.
+        """
+        self.get_expired_time_method = get_expired_time_method
+        self.out_of_time = False
+        self.nodes_searched = 0
+        self.prepare_tables(board)
+
+        # start with a random move, in case we don't even finish a one-ply search.
+        potential_moves = self.shuffle_moves(board.get_possible_moves()[which_player_am_I])
+        best_move = potential_moves[0]
+        if len(potential_moves) == 1:
+            return best_move
+
+        for depth in range(1, self.max_depth + 1):
+            score, move = self.search_root(board, which_player_am_I, depth)
+            if self.out_of_time:
+                break  # this iteration is incomplete, so we don't trust it.
+            best_move = move
+            if self.verbose:
+                print(f"Depth {depth}: best move = {best_move}, score = {score}, nodes = {self.nodes_searched}")
+            if abs(score) > WIN_THRESHOLD:
+                break  # the outcome is decided - no need to look any further.
+        return best_move
+
+    def prepare_tables(self, board: Board):
+        """
+        gets the killer and history tables ready for a new search. Killer moves are stored by ply, which means
+        something different each turn, so they are cleared; the history table is aged so that older information counts
+        for less.
+        :param board: the board we are about to search from.
+        :return: None
+        """
+        self.killer_moves = [[] for _ in range(self.max_depth + 1)]
+        rows, cols = board.board_array.shape
+        if self.history_table.shape != (rows, cols, 8):
+            self.history_table = np.zeros((rows, cols, 8), dtype=int)
+        else:
+            self.history_table //= 2
+
+    def search_root(self, board: Board, which_player: int, depth: int) -> Tuple[int, Move]:
+        """
+        runs a complete alpha-beta search to the given depth from the current position.
+        :param board: the current state of the board
+        :param which_player: whose turn it is
+        :param depth: how many plies to search
+        :return: (score, best move) from which_player's point of view. The move is None if we ran out of time before
+        the search finished.
+        """
+        score = self.negamax(board, which_player, depth, 0, -WIN_SCORE - 1, WIN_SCORE + 1)
+        if self.out_of_time:
+            return score, None
+        best_move = self.transposition_table[self.key_for_board(board, which_player)][3]
+        return score, best_move
+
+    def negamax(self, board: Board, which_player: int, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """
+        an alpha-beta search, in negamax form - the score is always from the point of view of which_player, the
+        player whose turn it is.
+        :param board: the state of the board
+        :param which_player: whose turn it is at this node
+        :param depth: how many more plies to search
+        :param ply: how far we are from the root
+        :param alpha: the score which_player is already guaranteed elsewhere
+        :param beta: the score the opponent is already guaranteed elsewhere (negated)
+        :return: the score of this board, from which_player's point of view.
+        """
+        self.nodes_searched += 1
+        if self.get_expired_time_method()[1] < self.time_margin:
+            self.out_of_time = True
+            return 0
+
+        possible_moves = board.get_possible_moves()
+        moves = possible_moves[which_player]
+        if len(moves) == 0:
+            return -WIN_SCORE + ply  # we lose... but the longer we hold out, the better.
+        if depth == 0:
+            return self.score_for_board(board, which_player, possible_moves=possible_moves)
+
+        original_alpha = alpha
+        key = self.key_for_board(board, which_player)
+        tt_move = None
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, tt_move = entry
+            entry_score = self.score_from_table(entry_score, ply)
+            if entry_depth >= depth and ply > 0:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                elif entry_flag == UPPER_BOUND:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        other_player = 1 - which_player
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for i, move in enumerate(self.order_moves(moves, ply, tt_move)):
+            board_copy = Board(board_to_copy=board)
+            board_copy.make_move_for_player(move, which_player)
+
+            if self.can_reduce(move, i, depth, ply, tt_move):
+                # a late move - try a cheap, shallow, null-window search first, and only search it properly if it
+                #    looks like it might beat alpha.
+                score = -self.negamax(board_copy, other_player, depth - 1 - LMR_REDUCTION, ply + 1,
+                                      -alpha - 1, -alpha)
+                if score > alpha:
+                    score = -self.negamax(board_copy, other_player, depth - 1, ply + 1, -beta, -alpha)
+            else:
+                score = -self.negamax(board_copy, other_player, depth - 1, ply + 1, -beta, -alpha)
+
+            if self.out_of_time:
+                return 0
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.record_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if len(self.transposition_table) >= MAX_TABLE_SIZE:
+            self.transposition_table.clear()
+        self.transposition_table[key] = (depth, self.score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def score_to_table(self, score: int, ply: int) -> int:
+        """
+        converts a score into the form we keep in the transposition table. Wins and losses are scored by how far they
+        are from the root, but the table outlives this search (and this root), so they are stored by how far they are
+        from this node instead.
+        :param score: the score, measured from the root of this search
+        :param ply: how far this node is from the root
+        :return: the score to store.
+        """
+        if score > WIN_THRESHOLD:
+            return score + ply
+        if score < -WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    def score_from_table(self, score: int, ply: int) -> int:
+        """
+        the reverse of score_to_table() - converts a stored score back to one measured from the root of this search.
+        :param score: the score from the transposition table
+        :param ply: how far this node is from the root
+        :return: the score, measured from the root.
+        """
+        if score > WIN_THRESHOLD:
+            return score - ply
+        if score < -WIN_THRESHOLD:
+            return score + ply
+        return score
+
+    def order_moves(self, moves: Possible_Moves_List, ply: int, tt_move: Optional[Move] = None) -> Possible_Moves_List:
+        """
+        sorts the moves so that the ones most likely to be good are searched first: the transposition-table move, then
+        the killer moves for this ply, then the rest by their history score. Ties are broken randomly.
+        :param moves: the moves to sort (this list is not modified.)
+        :param ply: how far from the root we are
+        :param tt_move: the best move stored in the transposition table for this position, if any.
+        :return: a new, sorted list of moves.
+        """
+        if len(moves) <= 1:
+            return list(moves)
+        killers = self.killer_moves[ply] if ply < len(self.killer_moves) else []
+
+        def order_score(move: Move) -> Tuple[int, float]:
+            # the random second value breaks ties between moves with the same score.
+            if move == tt_move:
+                return TT_MOVE_ORDER_SCORE, self.rng.random()
+            if move in killers:
+                return KILLER_ORDER_SCORE - killers.index(move), self.rng.random()
+            (r, c), heading = move
+            return int(self.history_table[r, c, heading]), self.rng.random()
+
+        return sorted(moves, key=order_score, reverse=True)
+
+    def can_reduce(self, move: Move, move_number: int, depth: int, ply: int, tt_move: Optional[Move]) -> bool:
+        """
+        decides whether this move is late enough in the ordering to be searched at a reduced depth.
+        :param move: the move under consideration
+        :param move_number: where this move falls in the ordered list (0 = first)
+        :param depth: how many more plies we were planning to search
+        :param ply: how far from the root we are
+        :param tt_move: the transposition-table move for this node, if any
+        :return: whether to use a late-move reduction.
+        """
+        if move_number < LMR_FULL_DEPTH_MOVES or depth < LMR_MIN_DEPTH or ply == 0:
+            return False
+        if move == tt_move:
+            return False
+        if ply < len(self.killer_moves) and move in self.killer_moves[ply]:
+            return False
+        return True
+
+    def record_cutoff(self, move: Move, depth: int, ply: int):
+        """
+        remembers a move that caused a beta cutoff, as a killer move for this ply and in the history table.
+        Deeper cutoffs save more work, so they get a bigger history bonus.
+        :param move: the move that caused the cutoff
+        :param depth: how many plies were left to search below this node
+        :param ply: how far from the root we are
+        :return: None
+        """
+        if ply < len(self.killer_moves):
+            killers = self.killer_moves[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+        (r, c), heading = move
+        self.history_table[r, c, heading] += depth * depth
+
+    def shuffle_moves(self, moves: Possible_Moves_List) -> Possible_Moves_List:
+        """
+        returns a shuffled copy of the list of moves, using this player's (possibly seeded) random number generator.
+        :param moves: the moves to shuffle (this list is not modified.)
+        :return: a new list with the same moves, in random order.
+        """
+        shuffled = list(moves)
+        self.rng.shuffle(shuffled)
+        return shuffled
+
+    def key_for_board(self, board: Board, which_player: int) -> bytes:
+        """
+        makes a compact key for the transposition table that describes this position completely: one byte per cell,
+        then the row, column and heading of each snake end, then whose turn it is.
+        :param board: the state of the board
+        :param which_player: whose turn it is
+        :return: a bytes object that can be used as a dictionary key.
+        """
+        locations = [value for ends in board.player_locations for (r, c), heading in ends for value in (r, c, heading)]
+        return board.board_array.astype(np.int8).tobytes() + bytes(locations) + bytes((which_player,))
+
+    def score_for_board(self, board: Board, which_player_am_I: int = 0,
+                        possible_moves: Optional[List[Possible_Moves_List]] = None) -> int:
+        """
+        a simple evaluation - how many more moves do I have available than my opponent? Override this in subclasses.
+        :param board: the state of the board
+        :param which_player_am_I: the player whose point of view we want the score from
+        :param possible_moves: board.get_possible_moves() for this board, if the search has already worked it out -
+        use it rather than generating the moves again. (None = not known yet.)
+        :return: the score - higher is better for which_player_am_I.
+        """
+        if possible_moves is None:
+            possible_moves = board.get_possible_moves()
+        return len(possible_moves[which_player_am_I]) - len(possible_moves[1 - which_player_am_I])